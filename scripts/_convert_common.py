@@ -0,0 +1,215 @@
+"""
+Helpers shared by the Schema 1 converter scripts.
+
+Kept next to the scripts, whose own directory is on sys.path when they
+are run directly:
+- scan_html(): the HTML tokenizer both converters are driven by
+- imap_documents(): ordered conversion in worker processes
+- digest_cache(): bounded memoization keyed by a digest of the HTML
+- SLUG_TABLE: str.translate table for the ASCII slug fast path
+"""
+
+import functools
+import hashlib
+import os
+import re
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+
+# ASCII fast path for slugs: str.translate drops the characters the regexes
+# would remove ([^\w\s-]) and maps whitespace in a single C-level pass
+_ASCII_WS = ''.join(c for c in map(chr, range(128)) if c.isspace())
+_ASCII_SPECIAL = ''.join(
+    c for c in map(chr, range(128)) if not (c.isalnum() or c.isspace() or c in '_-')
+)
+SLUG_TABLE = str.maketrans(_ASCII_WS, '-' * len(_ASCII_WS), _ASCII_SPECIAL)
+
+# Below this many documents, starting worker processes costs more than it saves
+PARALLEL_MIN_DOCUMENTS = 32
+
+# Chunks of documents sent to each worker at a time, and how many chunks
+# per worker may be queued or finished but not yet consumed
+PARALLEL_CHUNK_SIZE = 16
+PARALLEL_CHUNKS_AHEAD = 2
+
+# ProcessPoolExecutor refuses more workers than this on Windows
+_MAX_WINDOWS_WORKERS = 61
+
+
+def _map_chunk(func, items: list) -> list:
+    """Apply func to each item; the unit of work sent to a worker process."""
+    return [func(item) for item in items]
+
+
+def imap_documents(func, items: list, max_workers: int = None):
+    """Yield func(item) for each item in order, using worker processes for large batches.
+    
+    Results are yielded as soon as they are ready, so the caller can write
+    early documents while later ones are still being converted. Workers run
+    at most PARALLEL_CHUNKS_AHEAD chunks each ahead of the caller, so
+    unconsumed results never pile up.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if sys.platform == 'win32':
+        workers = min(workers, _MAX_WINDOWS_WORKERS)
+    if workers == 1 or len(items) < PARALLEL_MIN_DOCUMENTS:
+        yield from map(func, items)
+        return
+    
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(items), PARALLEL_CHUNK_SIZE):
+            chunk = items[start:start + PARALLEL_CHUNK_SIZE]
+            pending.append(executor.submit(_map_chunk, func, chunk))
+            if len(pending) >= workers * PARALLEL_CHUNKS_AHEAD:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def digest_cache(maxsize: int):
+    """Memoize a function of one string on a BLAKE2b digest of that string.
+    
+    Like functools.lru_cache(maxsize=maxsize), but the cache holds 16-byte
+    digests instead of the (often large) HTML itself. Every hit returns the
+    same object, so results must not be mutated.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        
+        @functools.wraps(func)
+        def wrapper(text: str):
+            key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+            result = cache.get(key)
+            if result is None:
+                result = cache[key] = func(text)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+# Markup recognised by scan_html(). Quoted attribute values may contain '>'.
+_RE_MARKUP_TAG = re.compile(r'<(/\s*)?([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+# One attribute: name, then an optional quoted or unquoted value (as html.parser)
+_RE_ATTR = re.compile(r'([^\s/>"\'=][^\s/=>]*)(?:\s*=+\s*("[^"]*"|\'[^\']*\'|(?![\'"])[^\s>]*))?')
+# CDATA and the other SGML marked sections end at ']]>', as in html.parser
+_RE_MARKED_SECTION = re.compile(r'<!\[(?:cdata|rcdata|temp|ignore|include)(?![-_.a-z0-9])', re.IGNORECASE)
+_RE_MARKED_SECTION_END = re.compile(r']\s*]\s*>')
+# Elements whose content is raw text, as in html.parser
+_RE_RAW_TEXT_END = {
+    'script': re.compile(r'</script\s*>', re.IGNORECASE),
+    'style': re.compile(r'</style\s*>', re.IGNORECASE),
+}
+
+
+def scan_html(html: str, on_open, on_close, on_text):
+    """
+    Walk HTML with str.find/regex matching and report tags and text.
+    
+    A much smaller tokenizer than html.parser, covering only what the
+    converter needs. Callbacks mirror HTMLParser's handle_* methods:
+    on_open(tag, attrs) and on_close(tag) get lowercased tag names,
+    on_text(data) gets text with character references decoded. attrs
+    only ever carries 'href' (for <a>); comments, declarations and
+    processing instructions are skipped.
+    
+    As in html.parser, an unquoted value keeps a trailing '/' (so the tag
+    is not self-closing) and a repeated attribute replaces the earlier one:
+    
+    >>> events = []
+    >>> scan_html('<a href=x href=y/>t</a><br/>',
+    ...           lambda tag, attrs: events.append(('open', tag, attrs)),
+    ...           lambda tag: events.append(('close', tag)),
+    ...           lambda text: events.append(('text', text)))
+    >>> events  # doctest: +NORMALIZE_WHITESPACE
+    [('open', 'a', [('href', 'y/')]), ('text', 't'), ('close', 'a'),
+     ('open', 'br', []), ('close', 'br')]
+    
+    Comments and CDATA sections are skipped whole, even around a '>':
+    
+    >>> texts = []
+    >>> scan_html('Before<![CDATA[ a > b ]]>After<!-- c > d -->',
+    ...           lambda tag, attrs: None, lambda tag: None, texts.append)
+    >>> texts
+    ['Before', 'After']
+    """
+    pos = 0
+    text_start = 0
+    
+    while True:
+        i = html.find('<', pos)
+        if i < 0:
+            break
+        
+        m = _RE_MARKUP_TAG.match(html, i)
+        if m is None:
+            if html.startswith('<!--', i):
+                end = html.find('-->', i + 4)
+                end = len(html) if end < 0 else end + 3
+            elif _RE_MARKED_SECTION.match(html, i):
+                section_end = _RE_MARKED_SECTION_END.search(html, i + 3)
+                end = section_end.end() if section_end else len(html)
+            elif html.startswith(('</', '<!', '<?'), i):
+                # Declarations, processing instructions and malformed end
+                # tags like </> are skipped up to the next '>'
+                end = html.find('>', i + 2)
+                end = len(html) if end < 0 else end + 1
+            else:
+                # A stray '<' is ordinary text
+                pos = i + 1
+                continue
+        else:
+            end = m.end()
+        
+        if i > text_start:
+            text = html[text_start:i]
+            on_text(unescape(text) if '&' in text else text)
+        pos = text_start = end
+        
+        if m is None:
+            continue
+        
+        closing, tag, attr_text = m.groups()
+        tag = tag.lower()
+        if closing:
+            on_close(tag)
+            continue
+        
+        self_closing = attr_text.endswith('/')
+        attrs = []
+        if tag == 'a' or self_closing:
+            for attr in _RE_ATTR.finditer(attr_text):
+                name, value = attr.groups()
+                if value is None:
+                    continue
+                if value[:1] in ('"', "'"):
+                    value = value[1:-1]
+                elif attr.end() == len(attr_text):
+                    # The '/' of '/>' belongs to an unquoted value: <a href=x/>
+                    self_closing = False
+                if tag == 'a' and name.lower() == 'href':
+                    attrs = [('href', unescape(value))]
+        on_open(tag, attrs)
+        
+        if self_closing:
+            on_close(tag)
+        elif tag in _RE_RAW_TEXT_END:
+            raw_end = _RE_RAW_TEXT_END[tag].search(html, pos)
+            raw_stop = raw_end.start() if raw_end else len(html)
+            if raw_stop > pos:
+                on_text(html[pos:raw_stop])
+            if raw_end:
+                on_close(tag)
+            pos = text_start = raw_end.end() if raw_end else len(html)
+    
+    if text_start < len(html):
+        text = html[text_start:]
+        on_text(unescape(text) if '&' in text else text)
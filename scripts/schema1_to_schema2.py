@@ -12,38 +12,110 @@ Usage:
 
 import argparse
 import json
+import os
 import re
-import uuid
-from html.parser import HTMLParser
+from html import unescape
 from pathlib import Path
 from typing import Any
 
+from _convert_common import SLUG_TABLE, digest_cache, imap_documents, scan_html
 
-class HTMLToBlockNoteConverter(HTMLParser):
+# Precompiled patterns shared by the slug, sort and fallback helpers
+_RE_NON_WORD = re.compile(r'[^\w\s-]')
+_RE_WS = re.compile(r'\s+')
+_RE_DASHES = re.compile(r'-+')
+_RE_DIGITS = re.compile(r'(\d+)')
+_RE_TAGS = re.compile(r'<[^>]+>')
+
+# Recent documents kept for reuse; Raptor projects often repeat boilerplate
+# bodies (front matter, author notes), which then skip parsing entirely.
+# Entries are serialized JSON keyed by a digest of the HTML, so a project
+# without repeats pays only for this many small strings per process
+HTML_CACHE_SIZE = 64
+
+# Default block props; copied per block because headings add a "level" key
+_PROPS_DEFAULT = {
+    "textColor": "default",
+    "backgroundColor": "default",
+    "textAlignment": "left"
+}
+
+# Tags are dispatched on every start/end event, so membership uses a frozenset
+HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+
+# Basic text styles are tracked as bit flags while parsing and only turned
+# into a BlockNote "styles" dict when a text node is emitted
+STYLE_BOLD = 1
+STYLE_ITALIC = 2
+STYLE_UNDERLINE = 4
+_STYLE_DICTS = tuple(
+    {
+        name: True
+        for flag, name in ((STYLE_BOLD, 'bold'), (STYLE_ITALIC, 'italic'), (STYLE_UNDERLINE, 'underline'))
+        if mask & flag
+    }
+    for mask in range(8)
+)
+
+# RFC 4122 variant: the top two bits of the clock_seq_hi byte are "10"
+_UUID_VARIANT = {c: '89ab'[int(c, 16) & 0x3] for c in '0123456789abcdef'}
+
+
+class _UUIDPool:
+    """Hand out random (version 4) UUID strings from a buffered os.urandom block.
+
+    uuid.uuid4() makes one os.urandom(16) call and builds a UUID object per
+    block; reading a few KB at a time and slicing the hex digits is much
+    cheaper when a manuscript has thousands of blocks.
+    """
+
+    def __init__(self, size: int = 4096):
+        self.size = size
+        self.refill()
+
+    def refill(self):
+        """Discard the buffered bytes and read a fresh block."""
+        self.hex = os.urandom(self.size).hex()
+        self.pos = 0
+
+    def next(self) -> str:
+        """Return the next UUID in canonical 8-4-4-4-12 form."""
+        if self.pos >= len(self.hex):
+            self.refill()
+        h = self.hex[self.pos:self.pos + 32]
+        self.pos += 32
+        return f"{h[0:8]}-{h[8:12]}-4{h[13:16]}-{_UUID_VARIANT[h[16]]}{h[17:20]}-{h[20:32]}"
+
+
+_UUID_POOL = _UUIDPool()
+
+# A forked child would otherwise replay the parent's buffered bytes
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_UUID_POOL.refill)
+
+
+class HTMLToBlockNoteConverter:
     """Convert HTML content to BlockNote JSON format."""
     
     def __init__(self):
-        super().__init__()
         self.blocks = []
         self.current_block = None
         self.current_content = []
-        self.current_styles = {}
+        self.style_mask = 0
+        self.link = None
         self.pending_text = []
+        self.word_count = 0
         
     def _generate_id(self) -> str:
         """Generate a UUID for block IDs."""
-        return str(uuid.uuid4())
+        return _UUID_POOL.next()
     
     def _create_block(self, block_type: str = "paragraph") -> dict:
         """Create a new BlockNote block."""
         return {
             "id": self._generate_id(),
             "type": block_type,
-            "props": {
-                "textColor": "default",
-                "backgroundColor": "default",
-                "textAlignment": "left"
-            },
+            "props": _PROPS_DEFAULT.copy(),
             "content": [],
             "children": []
         }
@@ -56,10 +128,22 @@ class HTMLToBlockNoteConverter(HTMLParser):
                 text_node = {
                     "type": "text",
                     "text": text,
-                    "styles": dict(self.current_styles)
+                    "styles": self._current_styles()
                 }
                 self.current_content.append(text_node)
-            self.pending_text = []
+                # Count words as text nodes are made, so the finished blocks
+                # don't need a second pass. Fragments are joined first: a
+                # word can span several handle_data() calls.
+                self.word_count += len(text.split())
+            # Reuse the buffer rather than allocating a new list per text node
+            self.pending_text.clear()
+    
+    def _current_styles(self) -> dict:
+        """Build the styles dict for a text node from the active style flags."""
+        styles = dict(_STYLE_DICTS[self.style_mask])
+        if self.link is not None:
+            styles['link'] = self.link
+        return styles
     
     def _flush_block(self):
         """Flush current block to blocks list."""
@@ -71,8 +155,6 @@ class HTMLToBlockNoteConverter(HTMLParser):
             self.current_content = []
     
     def handle_starttag(self, tag, attrs):
-        tag = tag.lower()
-        
         if tag == 'p':
             # Start a new paragraph - flush any existing content
             self._flush_block()
@@ -81,14 +163,14 @@ class HTMLToBlockNoteConverter(HTMLParser):
             self._flush_block()
         elif tag in ('strong', 'b'):
             self._flush_text()
-            self.current_styles['bold'] = True
+            self.style_mask |= STYLE_BOLD
         elif tag in ('em', 'i'):
             self._flush_text()
-            self.current_styles['italic'] = True
+            self.style_mask |= STYLE_ITALIC
         elif tag == 'u':
             self._flush_text()
-            self.current_styles['underline'] = True
-        elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self.style_mask |= STYLE_UNDERLINE
+        elif tag in HEADING_TAGS:
             self._flush_block()
             # For headings, we'll create a heading block
             level = int(tag[1])
@@ -96,26 +178,24 @@ class HTMLToBlockNoteConverter(HTMLParser):
             self.current_block["props"]["level"] = level
         elif tag == 'a':
             self._flush_text()
-            attrs_dict = dict(attrs)
-            href = attrs_dict.get('href', '')
+            # Last href wins, as dict(attrs) did
+            href = next((value for name, value in reversed(attrs) if name == 'href'), '')
             # Store link info for when we get the text
-            self.current_styles['link'] = href
+            self.link = href
     
     def handle_endtag(self, tag):
-        tag = tag.lower()
-        
         if tag == 'p':
             self._flush_block()
         elif tag in ('strong', 'b'):
             self._flush_text()
-            self.current_styles.pop('bold', None)
+            self.style_mask &= ~STYLE_BOLD
         elif tag in ('em', 'i'):
             self._flush_text()
-            self.current_styles.pop('italic', None)
+            self.style_mask &= ~STYLE_ITALIC
         elif tag == 'u':
             self._flush_text()
-            self.current_styles.pop('underline', None)
-        elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self.style_mask &= ~STYLE_UNDERLINE
+        elif tag in HEADING_TAGS:
             self._flush_text()
             if self.current_block:
                 self.current_block["content"] = self.current_content
@@ -124,59 +204,73 @@ class HTMLToBlockNoteConverter(HTMLParser):
                 self.current_content = []
         elif tag == 'a':
             self._flush_text()
-            self.current_styles.pop('link', None)
+            self.link = None
     
     def handle_data(self, data):
         # Collect text data
         self.pending_text.append(data)
     
+    def feed(self, html: str):
+        """Process an HTML string (the HTMLParser.feed() entry point)."""
+        scan_html(html, self.handle_starttag, self.handle_endtag, self.handle_data)
+    
     def get_blocknote_json(self) -> list:
         """Get the final BlockNote JSON structure."""
         # Flush any remaining content
         self._flush_block()
         return self.blocks
+    
+    def get_word_count(self) -> int:
+        """Get the number of words in all text seen so far."""
+        return self.word_count
 
 
-def html_to_blocknote(html: str) -> list:
-    """Convert HTML content to BlockNote JSON format."""
+def _paragraph_block(text: str) -> dict:
+    """Create a paragraph block holding a single unstyled text node."""
+    return {
+        "id": _UUID_POOL.next(),
+        "type": "paragraph",
+        "props": _PROPS_DEFAULT.copy(),
+        "content": [{"type": "text", "text": text, "styles": {}}],
+        "children": []
+    }
+
+
+def _parse_blocknote(html: str) -> tuple:
+    """Parse HTML into (BlockNote blocks, word count)."""
     if not html:
-        return []
+        return [], 0
+    
+    # Plain text (common for notes and outlines) is one paragraph; skip the scanner
+    if '<' not in html:
+        text = unescape(html) if '&' in html else html
+        return [_paragraph_block(text)], len(text.split())
     
     converter = HTMLToBlockNoteConverter()
     try:
         converter.feed(html)
         blocks = converter.get_blocknote_json()
         # Filter out completely empty blocks
-        return [b for b in blocks if b.get("content")]
+        return [b for b in blocks if b.get("content")], converter.get_word_count()
     except Exception as e:
         # If parsing fails, create a single paragraph with cleaned text
-        text = re.sub(r'<[^>]+>', '', html)
+        text = _RE_TAGS.sub('', html)
         if text.strip():
-            return [{
-                "id": str(uuid.uuid4()),
-                "type": "paragraph",
-                "props": {
-                    "textColor": "default",
-                    "backgroundColor": "default",
-                    "textAlignment": "left"
-                },
-                "content": [{"type": "text", "text": text.strip(), "styles": {}}],
-                "children": []
-            }]
-        return []
-
-
-def count_words(blocknote_content: list) -> int:
-    """Count words in BlockNote JSON content."""
-    text_parts = []
-    for block in blocknote_content:
-        for content_item in block.get("content", []):
-            if content_item.get("type") == "text":
-                text_parts.append(content_item.get("text", ""))
-    
-    full_text = ' '.join(text_parts)
-    words = full_text.split()
-    return len(words)
+            return [_paragraph_block(text.strip())], len(text.split())
+        return [], 0
+
+
+def html_to_blocknote(html: str) -> list:
+    """Convert HTML content to BlockNote JSON format."""
+    return _parse_blocknote(html)[0]
+
+
+def _natural_sort_part(part: str) -> tuple:
+    """Convert one text/number chunk of a title into a comparable tuple."""
+    # If it's a number, return as int for proper numerical sorting
+    if part.isdigit():
+        return (1, int(part))  # Numbers come after text
+    return (0, part.lower())  # Text comes first, case-insensitive
 
 
 def natural_sort_key(text: str) -> list:
@@ -184,31 +278,72 @@ def natural_sort_key(text: str) -> list:
     Generate a sort key for natural sorting.
     Alphabetical first, then numerical (e.g., Chapter 1, Chapter 2, Chapter 10).
     """
-    def convert(part):
-        # If it's a number, return as int for proper numerical sorting
-        if part.isdigit():
-            return (1, int(part))  # Numbers come after text
-        return (0, part.lower())  # Text comes first, case-insensitive
-    
     # Split into text and number parts
-    parts = re.split(r'(\d+)', text)
-    return [convert(part) for part in parts if part]
+    parts = _RE_DIGITS.split(text)
+    return [_natural_sort_part(part) for part in parts if part]
 
 
 def slugify_folder_name(title: str) -> str:
     """Convert folder title to slug for name field."""
     slug = title.strip().lower()
-    slug = re.sub(r'[^\w\s-]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
+    if slug.isascii():
+        slug = slug.translate(SLUG_TABLE)
+        while '--' in slug:
+            slug = slug.replace('--', '-')
+        return slug.strip('-')
+    
+    slug = _RE_NON_WORD.sub('', slug)
+    slug = _RE_WS.sub('-', slug)
+    slug = _RE_DASHES.sub('-', slug)
     return slug.strip('-')
 
 
-def convert_document(doc: dict, order: int) -> dict:
-    """Convert a Schema 1 document to Schema 2 format."""
-    html_content = doc.get('content', '')
-    blocknote_content = html_to_blocknote(html_content)
-    word_count = count_words(blocknote_content)
+@digest_cache(HTML_CACHE_SIZE)
+def _serialize_blocks(html: str) -> tuple:
+    """Convert HTML to (tuple of block JSON bodies without "id", word count)."""
+    blocks, word_count = _parse_blocknote(html)
+    # "id" is each block's first key; dropping the leading "{" lets
+    # convert_content() splice in a fresh ID per block
+    bodies = tuple(
+        json.dumps(
+            {key: value for key, value in block.items() if key != "id"},
+            separators=(',', ':')
+        )[1:]
+        for block in blocks
+    )
+    return bodies, word_count
+
+
+def convert_content(html: str) -> tuple:
+    """Convert HTML to a (BlockNote JSON string, word count) pair.
+    
+    Kept at module level and returning plain strings so it can run in
+    worker processes without pickling block lists back to the parent.
+    Non-ASCII text is escaped, so a lone surrogate (left when JavaScript
+    cuts a string mid-emoji) still writes out as UTF-8:
+    
+    >>> content, word_count = convert_content('<p>cut \\ud83d</p>')
+    >>> '"text":"cut \\\\ud83d"' in content, word_count
+    (True, 2)
+    """
+    bodies, word_count = _serialize_blocks(html)
+    # Stored as JSON string; compact like the web converter's JSON.stringify,
+    # with fresh IDs so repeated content never shares block IDs
+    content = '[' + ','.join(
+        f'{{"id":"{_UUID_POOL.next()}",{body}' for body in bodies
+    ) + ']'
+    return content, word_count
+
+
+def convert_document(doc: dict, order: int, converted: tuple = None) -> dict:
+    """Convert a Schema 1 document to Schema 2 format.
+    
+    `converted` is the document's convert_content() result when it has
+    already been computed (e.g. in a worker process).
+    """
+    if converted is None:
+        converted = convert_content(doc.get('content', ''))
+    content, word_count = converted
     
     # Map status: "active" -> "draft"
     status = doc.get('status', 'active')
@@ -226,7 +361,7 @@ def convert_document(doc: dict, order: int) -> dict:
         "label_color": None,
         "card_color": None,
         "icon": None,
-        "content": json.dumps(blocknote_content),  # Stored as JSON string
+        "content": content,  # Stored as JSON string
         "synopsis": doc.get('summary') if doc.get('summary') else None,
         "notes": None,
         "label": None,
@@ -238,35 +373,48 @@ def convert_document(doc: dict, order: int) -> dict:
     }
 
 
-def convert_folder(folder: dict, docs_by_id: dict, trash_doc_ids: set, order: int) -> dict:
+def active_documents(docs_by_id: dict, trash_doc_ids: set) -> dict:
+    """Return the documents that may be exported, keyed by ID.
+    
+    Trashed, empty and inactive documents are left out, so folders only
+    need a single membership test per document ID.
+    """
+    return {
+        doc_id: doc
+        for doc_id, doc in docs_by_id.items()
+        if doc and doc_id not in trash_doc_ids and doc.get('status') in (None, 'active')
+    }
+
+
+def folder_document_ids(folder: dict, active_docs: dict) -> list:
+    """Return the IDs of a folder's documents that should be converted."""
+    return [doc_id for doc_id in folder.get('documentIds', []) if doc_id in active_docs]
+
+
+def convert_folder(folder: dict, active_docs: dict, order: int,
+                   converted_by_id: dict = None) -> dict:
     """Convert a Schema 1 folder to Schema 2 format.
     
+    `active_docs` is the active_documents() mapping for the project.
+    `converted_by_id` maps document IDs to precomputed convert_content()
+    results; documents missing from it are converted here.
+    
     Returns None if folder has no valid documents.
     """
-    documents = []
+    converted_by_id = converted_by_id or {}
     
-    for doc_id in folder.get('documentIds', []):
-        # Skip trashed documents
-        if doc_id in trash_doc_ids:
-            continue
-        
-        doc = docs_by_id.get(doc_id)
-        if not doc:
-            continue
-        
-        # Skip inactive documents
-        if doc.get('status') not in (None, 'active'):
-            continue
-        
-        # Convert document (order will be assigned after sorting)
-        converted_doc = convert_document(doc, 0)
-        documents.append(converted_doc)
+    # Convert documents (order will be assigned after sorting)
+    documents = [
+        convert_document(active_docs[doc_id], 0, converted_by_id.get(doc_id))
+        for doc_id in folder_document_ids(folder, active_docs)
+    ]
     
     # Return None if no documents (will be filtered out)
     if not documents:
         return None
     
-    # Sort documents using natural sort on title
+    # Sort documents using natural sort on title; key= computes each key
+    # exactly once per document, so there is nothing left to precompute
     documents.sort(key=lambda d: natural_sort_key(d.get('title', '')))
     
     # Reassign order after sorting
@@ -286,47 +434,60 @@ def convert_folder(folder: dict, docs_by_id: dict, trash_doc_ids: set, order: in
     }
 
 
-def convert_schema1_to_schema2(schema1_data: dict) -> dict:
-    """Convert Schema 1 JSON to Schema 2 JSON format."""
+def select_folders(schema1_data: dict) -> tuple:
+    """Pick the folders and documents to export.
+    
+    Returns (active_docs, selected) where selected lists (folder, document IDs)
+    pairs in output order, with trashed, inactive and empty folders dropped.
+    """
     docs_by_id = schema1_data.get('documentsById', {})
     folders = schema1_data.get('folders', [])
     trash = schema1_data.get('trash', {})
     trash_doc_ids = set(trash.get('documentIds', []))
     trash_folder_ids = set(trash.get('folderIds', []))
+    active_docs = active_documents(docs_by_id, trash_doc_ids)
     
     # Sort folders by sort order
     sorted_folders = sorted(folders, key=lambda f: f.get('sort', 0))
     
-    # Convert folders (filtering out empty ones)
-    converted_folders = []
-    folder_order = 0
+    selected = []
     for folder in sorted_folders:
-        folder_id = folder.get('id', '')
-        
-        # Skip trashed folders
-        if folder_id in trash_folder_ids:
+        # Skip trashed and inactive folders
+        if folder.get('id', '') in trash_folder_ids:
             continue
-        
-        # Skip inactive folders
         if folder.get('status') not in (None, 'active'):
             continue
         
-        converted_folder = convert_folder(folder, docs_by_id, trash_doc_ids, folder_order)
-        
-        # Skip empty folders (convert_folder returns None if no documents)
-        if converted_folder is None:
-            continue
-        
-        converted_folders.append(converted_folder)
-        folder_order += 1
+        # Skip empty folders
+        doc_ids = folder_document_ids(folder, active_docs)
+        if doc_ids:
+            selected.append((folder, doc_ids))
+    
+    return active_docs, selected
+
+
+def iter_converted_folders(active_docs: dict, selected: list, max_workers: int = None):
+    """Convert the select_folders() result, yielding Schema 2 folders in order.
+    
+    Document HTML is converted in up to `max_workers` processes (default:
+    one per CPU; 1 converts everything in this process). Converted documents
+    are held only for the current folder plus the few chunks workers may
+    have finished ahead of it (see imap_documents()).
+    """
+    htmls = [active_docs[doc_id].get('content', '') for _, doc_ids in selected for doc_id in doc_ids]
+    contents = imap_documents(convert_content, htmls, max_workers)
     
+    for folder_order, (folder, doc_ids) in enumerate(selected):
+        converted_by_id = {doc_id: next(contents) for doc_id in doc_ids}
+        yield convert_folder(folder, active_docs, folder_order, converted_by_id)
+
+
+def convert_project(schema1_data: dict, total_docs: int) -> dict:
+    """Build the Schema 2 project fields (everything except "folders")."""
     # Get project title
     title = schema1_data.get('title', 'Untitled')
     title = title.replace(' ', '_')  # Schema 2 uses underscores
     
-    # Count total chapters
-    total_docs = sum(len(f.get('documents', [])) for f in converted_folders)
-    
     return {
         "title": title,
         "author": None,
@@ -337,10 +498,49 @@ def convert_schema1_to_schema2(schema1_data: dict) -> dict:
         "story_hook": None,
         "story_pitch": None,
         "status": "draft",
-        "folders": converted_folders
     }
 
 
+def convert_schema1_to_schema2(schema1_data: dict, max_workers: int = None) -> dict:
+    """Convert Schema 1 JSON to Schema 2 JSON format.
+    
+    Document HTML is converted in up to `max_workers` processes
+    (default: one per CPU; 1 converts everything in this process).
+    """
+    active_docs, selected = select_folders(schema1_data)
+    
+    # Count total chapters
+    total_docs = sum(len(doc_ids) for _, doc_ids in selected)
+    
+    schema2_data = convert_project(schema1_data, total_docs)
+    schema2_data["folders"] = list(iter_converted_folders(active_docs, selected, max_workers))
+    return schema2_data
+
+
+def write_schema2_ndjson(schema1_data: dict, f, max_workers: int = None) -> tuple:
+    """Convert Schema 1 JSON and write Schema 2 as newline-delimited JSON.
+    
+    The first line is {"project": ...} (the Schema 2 fields except
+    "folders"); each folder follows as {"folder": ...} without its
+    "documents", then one {"document": ...} line per document. Folders are
+    written as they are converted, so the converted output held in memory
+    stays near one folder's worth; the Schema 1 input is still loaded whole.
+    
+    Returns (folder count, document count).
+    """
+    active_docs, selected = select_folders(schema1_data)
+    total_docs = sum(len(doc_ids) for _, doc_ids in selected)
+    
+    f.write(json.dumps({"project": convert_project(schema1_data, total_docs)}, ensure_ascii=False) + '\n')
+    for folder in iter_converted_folders(active_docs, selected, max_workers):
+        documents = folder.pop("documents")
+        f.write(json.dumps({"folder": folder}, ensure_ascii=False) + '\n')
+        for doc in documents:
+            f.write(json.dumps({"document": doc}, ensure_ascii=False) + '\n')
+    
+    return len(selected), total_docs
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert Schema 1 JSON to Schema 2 JSON format',
@@ -349,12 +549,19 @@ def main():
 Examples:
     python schema1_to_schema2.py project.json output.json
     python schema1_to_schema2.py project.json  # outputs to project_schema2.json
+    python schema1_to_schema2.py --ndjson project.json  # outputs to project_schema2.ndjson
         """
     )
     parser.add_argument('input', help='Input Schema 1 JSON file')
     parser.add_argument('output', nargs='?', help='Output Schema 2 JSON file')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Worker processes for HTML conversion (default: one per CPU)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Write newline-delimited JSON, one project/folder/document per line')
     
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
     
     input_path = Path(args.input)
     if not input_path.exists():
@@ -364,7 +571,9 @@ Examples:
     if args.output:
         output_path = Path(args.output)
     else:
-        output_path = input_path.with_stem(input_path.stem + '_schema2')
+        # One with_name() call; Path.with_stem() would also need Python 3.9+
+        suffix = '.ndjson' if args.ndjson else input_path.suffix
+        output_path = input_path.with_name(f"{input_path.stem}_schema2{suffix}")
     
     print(f"Converting: {input_path} → {output_path}")
     
@@ -372,17 +581,22 @@ Examples:
     with open(input_path, 'r', encoding='utf-8') as f:
         schema1_data = json.load(f)
     
-    # Convert to Schema 2
-    schema2_data = convert_schema1_to_schema2(schema1_data)
-    
-    # Write output
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(schema2_data, f, indent=2, ensure_ascii=False)
+    if args.ndjson:
+        # Convert and write folder by folder
+        with open(output_path, 'w', encoding='utf-8') as f:
+            folder_count, doc_count = write_schema2_ndjson(schema1_data, f, max_workers=args.jobs)
+    else:
+        # Convert to Schema 2
+        schema2_data = convert_schema1_to_schema2(schema1_data, max_workers=args.jobs)
+        
+        # Write output
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(schema2_data, f, indent=2, ensure_ascii=False)
+        
+        folder_count = len(schema2_data.get('folders', []))
+        doc_count = sum(len(f.get('documents', [])) for f in schema2_data.get('folders', []))
     
     # Print stats
-    folder_count = len(schema2_data.get('folders', []))
-    doc_count = sum(len(f.get('documents', [])) for f in schema2_data.get('folders', []))
-    
     print(f"✓ Created {output_path}")
     print(f"  Folders: {folder_count}")
     print(f"  Documents: {doc_count}")